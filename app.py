@@ -2,6 +2,7 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import joblib
+from joblib import Parallel, delayed, effective_n_jobs
 import json
 from datetime import datetime
 from sklearn.base import BaseEstimator, TransformerMixin
@@ -9,40 +10,103 @@ from sklearn.base import BaseEstimator, TransformerMixin
 # ==============================================================================
 # 1. CUSTOM CLASSES (PFLICHT)
 # ==============================================================================
-class DateFeatureTransformer(BaseEstimator, TransformerMixin):
+def split_year_month(dates):
+    # Jahr/Monat direkt aus dem datetime64[M]-Offset seit 1970-01 (ohne .dt-Accessor); NaT bleibt NaN
+    months = dates.astype('datetime64[M]')
+    offset = months.astype(np.int64)
+    years, month_of_year = 1970 + offset // 12, 1 + offset % 12
+    missing = np.isnat(months)
+    if missing.any():
+        years, month_of_year = np.where(missing, np.nan, years), np.where(missing, np.nan, month_of_year)
+    return years, month_of_year
+
+class ParallelTransformerMixin:
+    # Batch-Helfer: Zeilenblöcke parallel in Threads transformieren (numpy/pandas geben den GIL frei).
+    # Unter parallel_min_rows lohnt sich Split + Concat nicht -> direkt transform().
+    parallel_min_rows = 10_000
+    def transform_parallel(self, X, n_jobs=-1):
+        n_chunks = effective_n_jobs(n_jobs)
+        if len(X) < self.parallel_min_rows or n_chunks < 2:
+            return self.transform(X)
+        bounds = np.linspace(0, len(X), n_chunks + 1, dtype=int)
+        parts = Parallel(n_jobs=n_chunks, backend="threading")(
+            delayed(self.transform)(X.iloc[start:stop]) for start, stop in zip(bounds[:-1], bounds[1:]))
+        return pd.concat(parts)
+
+class DateFeatureTransformer(ParallelTransformerMixin, BaseEstimator, TransformerMixin):
     def __init__(self, date_col): self.date_col = date_col
     def fit(self, X, y=None): return self
     def transform(self, X):
-        X = X.copy()
-        X[self.date_col] = pd.to_datetime(X[self.date_col])
-        X['post_year'], X['post_month'] = X[self.date_col].dt.year, X[self.date_col].dt.month
-        return X.drop(columns=[self.date_col])
+        dates = pd.to_datetime(X[self.date_col])
+        if dates.dt.tz is not None:
+            dates = dates.dt.tz_localize(None)
+        X = X.drop(columns=[self.date_col])  # drop() liefert schon einen neuen Frame
+        X['post_year'], X['post_month'] = split_year_month(dates.to_numpy())
+        return X
+    def transform_row(self, row):
+        date_val = pd.Timestamp(row.pop(self.date_col))
+        row['post_year'], row['post_month'] = date_val.year, date_val.month
+        return row
 
-class GroupMedianImputer(BaseEstimator, TransformerMixin):
+class GroupMedianImputer(ParallelTransformerMixin, BaseEstimator, TransformerMixin):
     def __init__(self, group_col, target_col):
         self.group_col, self.target_col = group_col, target_col
         self.group_medians, self.global_median = {}, 0
     def fit(self, X, y=None):
         self.global_median = X[self.target_col].median()
         self.group_medians = X.groupby(self.group_col)[self.target_col].median().to_dict()
+        self._median_lookup = None
         return self
+    def _lookup(self):
+        # Lazy, da gepickelte Modelle diesen Cache nicht haben; Code -1 (unbekannt) -> globaler Median im letzten Slot
+        if getattr(self, '_median_lookup', None) is None:
+            categories = pd.Index(list(self.group_medians))
+            medians = np.fromiter((self.group_medians[c] for c in categories), dtype=np.float64, count=len(categories))
+            medians[np.isnan(medians)] = self.global_median
+            self._median_lookup = (categories, np.append(medians, self.global_median))
+        return self._median_lookup
     def transform(self, X):
-        X = X.copy()
-        X[self.target_col] = X.apply(lambda r: self.group_medians.get(r[self.group_col], self.global_median) if pd.isna(r[self.target_col]) else r[self.target_col], axis=1)
+        X = X.copy(deep=False)
+        categories, medians = self._lookup()
+        values = X[self.target_col].to_numpy(dtype=np.float64, copy=True)
+        codes = categories.get_indexer(X[self.group_col])
+        np.putmask(values, np.isnan(values), medians[codes])
+        X[self.target_col] = values
         return X
+    def transform_row(self, row):
+        if pd.isna(row[self.target_col]):
+            fill = self.group_medians.get(row[self.group_col], self.global_median)
+            row[self.target_col] = self.global_median if pd.isna(fill) else fill  # wie in _lookup
+        return row
 
-class CustomTargetEncoder(BaseEstimator, TransformerMixin):
+class CustomTargetEncoder(ParallelTransformerMixin, BaseEstimator, TransformerMixin):
     def __init__(self, group_col, target_col):
         self.group_col, self.target_col = group_col, target_col
         self.mappings, self.global_mean = {}, 0
     def fit(self, X, y=None):
         self.global_mean = X[self.target_col].mean()
         self.mappings = X.groupby(self.group_col)[self.target_col].mean().to_dict()
+        self._encoding_lookup = None
         return self
+    def _lookup(self):
+        # Wie GroupMedianImputer._lookup: unbekannte Kategorie (Code -1) -> globaler Mittelwert im letzten Slot
+        if getattr(self, '_encoding_lookup', None) is None:
+            categories = pd.Index(list(self.mappings))
+            encodings = np.fromiter((self.mappings[c] for c in categories), dtype=np.float64, count=len(categories))
+            encodings[np.isnan(encodings)] = self.global_mean
+            self._encoding_lookup = (categories, np.append(encodings, self.global_mean))
+        return self._encoding_lookup
     def transform(self, X):
-        X = X.copy()
-        X[self.group_col + '_encoded'] = X[self.group_col].map(self.mappings).fillna(self.global_mean)
-        return X.drop(columns=[self.group_col])
+        # geo_plz bleibt erhalten: der gepickelte Preprocessor (num_special) wählt die Spalte weiterhin aus
+        X = X.copy(deep=False)
+        categories, encodings = self._lookup()
+        codes = categories.get_indexer(X[self.group_col])
+        X[self.group_col + '_encoded'] = encodings[codes]
+        return X
+    def transform_row(self, row):
+        encoded = self.mappings.get(row[self.group_col], self.global_mean)
+        row[self.group_col + '_encoded'] = self.global_mean if pd.isna(encoded) else encoded  # wie in _lookup
+        return row
 
 # ==============================================================================
 # 2. DESIGN & CSS (TOTAL-FIX FÜR SICHTBARKEIT)
@@ -117,12 +181,154 @@ st.markdown("""
 def load_geo_data():
     try:
         with open('geo_data.json', 'r', encoding='utf-8') as f:
-            return json.load(f)
+            data = json.load(f)
+        # PLZ-Listen als Tupel: unveränderlich und schneller zu iterieren
+        return {s: {c: tuple(plzs) for c, plzs in cities.items()} for s, cities in data.items()}
     except FileNotFoundError:
         return None
 
 GEO_DATA = load_geo_data()
 
+# Modell laden (cache_resource: gleiche Instanz für alle Reruns, kein Hashing)
+@st.cache_resource
+def get_model():
+    return joblib.load('mzyana_lightgbm_model.pkl')
+
+# Direkte Booster-Vorhersage für eine Zeile: der gefittete Pipeline-Zustand wird einmal in
+# Arrays/Dicts entpackt, pro Klick wird nur ein float64-Vektor befüllt (kein pandas).
+class DirectScorer:
+
+    def __init__(self, model):
+        self.inverse_func = getattr(model, "inverse_func", None)
+        pipeline = getattr(model, "regressor_", model)
+        if not hasattr(pipeline, "named_steps"):
+            raise ValueError("model is not a Pipeline")
+
+        steps = list(pipeline.named_steps.items())
+        names = [name for name, _ in steps]
+        if "prep" not in names or names[-1] == "prep":
+            raise ValueError("pipeline has no 'prep' step followed by an estimator")
+        prep_pos = names.index("prep")
+
+        self.row_steps = [step for _, step in steps[:prep_pos]]
+        for step in self.row_steps:
+            if not hasattr(step, "transform_row"):
+                raise ValueError(f"no row fast path for {type(step).__name__}")
+
+        estimator = steps[-1][1]
+        if not hasattr(estimator, "booster_"):
+            raise ValueError("final estimator is not a fitted LightGBM model")
+        self.booster = estimator.booster_
+        self.n_features = self.booster.num_feature()
+
+        prep = pipeline.named_steps["prep"]
+        self.numeric = []
+        self.categorical = []
+        for name, transformer, columns in prep.transformers_:
+            if transformer == "drop" or name not in prep.output_indices_:
+                continue
+            out = prep.output_indices_[name]
+            if out.stop - out.start == 0:
+                continue
+            sub_steps = transformer.steps if hasattr(transformer, "steps") else [(name, transformer)]
+            encoder = sub_steps[-1][1]
+            if type(encoder).__name__ == "OneHotEncoder":
+                self.categorical.append(self._unpack_categorical(sub_steps, list(columns), out))
+            else:
+                self.numeric.append(self._unpack_numeric(sub_steps, list(columns), out))
+
+        covered = sum(out.stop - out.start for *_, out in self.numeric + self.categorical)
+        if covered != self.n_features:
+            raise ValueError(f"preprocessor yields {covered} features, booster expects {self.n_features}")
+
+    @staticmethod
+    def _unpack_numeric(sub_steps, columns, out):
+        fill = np.full(len(columns), np.nan)
+        center = np.zeros(len(columns))
+        scale = np.ones(len(columns))
+        # score() always fills first and scales second, so only that order can be mirrored.
+        seen_imputer = seen_scaler = False
+        for _, step in sub_steps:
+            kind = type(step).__name__
+            if step == "passthrough" or (kind == "FunctionTransformer" and step.func is None):
+                continue
+            if kind == "SimpleImputer" and not step.add_indicator and len(step.statistics_) == len(columns):
+                if seen_imputer or seen_scaler:
+                    raise ValueError("numeric block must have at most one imputer, before the scaler")
+                seen_imputer = True
+                fill = np.asarray(step.statistics_, dtype=np.float64)
+            elif kind == "RobustScaler":
+                if seen_scaler:
+                    raise ValueError("numeric block has more than one scaler")
+                seen_scaler = True
+                if step.center_ is not None:
+                    center = np.asarray(step.center_, dtype=np.float64)
+                if step.scale_ is not None:
+                    scale = np.asarray(step.scale_, dtype=np.float64)
+            else:
+                raise ValueError(f"unsupported numeric step {kind}")
+        if out.stop - out.start != len(columns):
+            raise ValueError("numeric block changes the number of columns")
+        return columns, fill, center, scale, out
+
+    @staticmethod
+    def _unpack_categorical(sub_steps, columns, out):
+        fill_value = None
+        for _, step in sub_steps[:-1]:
+            if type(step).__name__ != "SimpleImputer" or step.strategy != "constant" or step.add_indicator:
+                raise ValueError(f"unsupported categorical step {type(step).__name__}")
+            fill_value = step.fill_value
+        encoder = sub_steps[-1][1]
+        if encoder.drop_idx_ is not None or getattr(encoder, "_infrequent_enabled", False):
+            raise ValueError("OneHotEncoder with drop/infrequent categories is not supported")
+        if encoder.handle_unknown != "ignore":
+            # model.predict raises on unseen categories; an all-zero block would hide that.
+            raise ValueError(f"OneHotEncoder with handle_unknown={encoder.handle_unknown!r} is not supported")
+        lookups = []
+        offset = out.start
+        for categories in encoder.categories_:
+            lookups.append({cat: offset + idx for idx, cat in enumerate(categories)})
+            offset += len(categories)
+        if offset != out.stop:
+            raise ValueError("one-hot block size mismatch")
+        return columns, fill_value, lookups, out
+
+    def score(self, values: dict) -> float:
+        row = dict(values)
+        for step in self.row_steps:
+            row = step.transform_row(row)
+
+        features = np.zeros((1, self.n_features), dtype=np.float64)
+        vector = features[0]
+        for columns, fill, center, scale, out in self.numeric:
+            raw = np.array([float(row[col]) for col in columns])
+            raw = np.where(np.isnan(raw), fill, raw)
+            vector[out] = (raw - center) / scale
+        for columns, fill_value, lookups, _ in self.categorical:
+            for col, lookup in zip(columns, lookups):
+                value = row[col]
+                if value is None and fill_value is not None:
+                    value = fill_value
+                idx = lookup.get(value)
+                if idx is not None:
+                    vector[idx] = 1.0
+
+        pred = self.booster.predict(features)
+        if self.inverse_func is not None:
+            pred = self.inverse_func(pred)
+        return float(pred[0])
+
+@st.cache_resource
+def get_scorer():
+    try:
+        scorer = DirectScorer(get_model())
+        # Probelauf mit der Vorlage: fehlt nach den row_steps eine Spalte, die ein Block liest,
+        # lieber model.predict nutzen (klarere sklearn-Fehlermeldung als ein nackter KeyError)
+        scorer.score(dict(zip(INPUT_COLUMNS, TEMPLATE_DF.iloc[0])))
+    except (AttributeError, KeyError, ValueError):
+        return None  # unbekanntes Pipeline-Layout -> model.predict
+    return scorer
+
 # Mappings
 HEATING_MAP = {
     "Zentralheizung": "central_heating", "Fernwärme": "district_heating", "Gas-Heizung": "gas_heating", 
@@ -143,6 +349,28 @@ TYPE_MAP = {
 }
 QUAL_MAP = {"Normal": "normal", "Gehoben": "sophisticated", "Luxus": "luxury", "Einfach": "simple"}
 
+# Eingabe-Schema (Spaltenreihenfolge + dtypes exakt wie im Training, damit der Preprocessor
+# nicht umsortiert). Die Vorlage wird einmal gebaut und pro Vorhersage nur kopiert und befüllt.
+INPUT_SCHEMA = {
+    'livingSpace': 'float64', 'noRooms': 'float64', 'floor': 'float64', 'regio1': 'object',
+    'regio2': 'object', 'heatingType': 'object', 'condition': 'object', 'interiorQual': 'object', 'typeOfFlat': 'object',
+    'balcony': 'bool', 'lift': 'bool', 'hasKitchen': 'bool', 'garden': 'bool', 'cellar': 'bool',
+    'condition_was_missing': 'int64', 'interiorQual_was_missing': 'int64', 'heatingType_was_missing': 'int64', 'yearConstructed_was_missing': 'int64',
+    'yearConstructed': 'float64', 'geo_plz': 'object', 'date': 'datetime64[ns]'
+}
+INPUT_COLUMNS = list(INPUT_SCHEMA)
+DATETIME_COLUMNS = {col for col, dt in INPUT_SCHEMA.items() if dt.startswith('datetime64')}
+TEMPLATE_DF = pd.DataFrame({col: np.zeros(1, dtype=dt) for col, dt in INPUT_SCHEMA.items()})
+
+def build_input_frame(values):
+    df = TEMPLATE_DF.copy()
+    for idx, col in enumerate(INPUT_COLUMNS):
+        value = values[col]
+        if col in DATETIME_COLUMNS and getattr(value, 'tzinfo', None) is not None:
+            value = value.tz_localize(None)  # Wandzeit wie im DateFeatureTransformer, Spalte bleibt datetime64[ns]
+        df.iat[0, idx] = value
+    return df
+
 # ==============================================================================
 # 4. APP INTERFACE
 # ==============================================================================
@@ -156,28 +384,32 @@ if GEO_DATA is None:
 
 
 # --- STANDORT (AUSSERHALB DES FORMS, DAMIT SYNC FUNKTIONIERT) ---
-def build_plz_index(data):
-    index = {}
-    for state_key, cities in data.items():
-        for city_key, plzs in cities.items():
-            for plz_val in plzs:
-                if plz_val not in index:
-                    index[plz_val] = (state_key, city_key)
-    return index
-
-PLZ_INDEX = build_plz_index(GEO_DATA)
+# Sortierte Listen einmalig berechnen statt bei jedem Rerun neu zu sortieren
+# (_data: Streamlit soll das große Dict nicht bei jedem Aufruf hashen)
+@st.cache_data
+def precompute_geo(_data):
+    states = sorted(_data.keys())
+    cities = {s: sorted(_data[s].keys()) for s in states}
+    plzs = {(s, c): tuple(sorted(_data[s][c])) for s in states for c in cities[s]}
+    # Flache Comprehension statt verschachtelter Schleife mit "not in"-Check. Rückwärts iteriert,
+    # damit bei doppelten PLZ (189 Stück) wie bisher der erste Eintrag in Dateireihenfolge gewinnt.
+    plz_index = {p: (s, c) for s, city_map in reversed(_data.items())
+                 for c, ps in reversed(city_map.items()) for p in reversed(ps)}
+    return states, cities, plzs, plz_index
+
+STATES, CITIES, PLZS, PLZ_INDEX = precompute_geo(GEO_DATA)
 
 def init_location_state():
     if "s_state" not in st.session_state:
-        st.session_state.s_state = sorted(GEO_DATA.keys())[0]
+        st.session_state.s_state = STATES[0]
     if "s_city" not in st.session_state:
-        st.session_state.s_city = sorted(GEO_DATA[st.session_state.s_state].keys())[0]
+        st.session_state.s_city = CITIES[st.session_state.s_state][0]
     if "s_plz" not in st.session_state:
-        st.session_state.s_plz = sorted(GEO_DATA[st.session_state.s_state][st.session_state.s_city])[0]
+        st.session_state.s_plz = PLZS[(st.session_state.s_state, st.session_state.s_city)][0]
 
 def update_cities():
     state_key = st.session_state.s_state
-    cities = sorted(GEO_DATA[state_key].keys())
+    cities = CITIES[state_key]
     if st.session_state.s_city not in cities:
         st.session_state.s_city = cities[0]
     update_plz_list()
@@ -185,7 +417,7 @@ def update_cities():
 def update_plz_list():
     state_key = st.session_state.s_state
     city_key = st.session_state.s_city
-    plzs = sorted(GEO_DATA[state_key][city_key])
+    plzs = PLZS[(state_key, city_key)]
     if st.session_state.s_plz not in plzs:
         st.session_state.s_plz = plzs[0]
 
@@ -199,13 +431,13 @@ def sync_from_plz():
 init_location_state()
 
 st.markdown("### 1. Standort")
-all_states = sorted(list(GEO_DATA.keys()))
+all_states = STATES
 state = st.selectbox("Bundesland", all_states, key="s_state", on_change=update_cities)
 
-available_cities = sorted(list(GEO_DATA[state].keys()))
+available_cities = CITIES[state]
 city = st.selectbox("Stadt / Landkreis (Tippen zum Suchen)", available_cities, key="s_city", on_change=update_plz_list)
 
-available_plzs = sorted(GEO_DATA[state][city])
+available_plzs = PLZS[(state, city)]
 plz = st.selectbox("Postleitzahl", available_plzs, key="s_plz", on_change=sync_from_plz)
 
 st.caption(f"Gewaehlt: {plz} {city}, {state}")
@@ -251,34 +483,37 @@ with st.form("main_form"):
 
 if submit:
     try:
-        model = joblib.load('mzyana_lightgbm_model.pkl')
-        
-        # Dataframe exakt wie im Training
-        df_input = pd.DataFrame({
-            'date': [pd.to_datetime(date_val)],
-            'livingSpace': [float(living_space)],
-            'noRooms': [float(rooms)],
-            'floor': [float(floor)],
-            'regio1': [state],
-            'regio2': [city],
-            'heatingType': [HEATING_MAP[heating]],
-            'condition': [CONDITION_MAP[condition]],
-            'interiorQual': [QUAL_MAP[quality]],
-            'typeOfFlat': [TYPE_MAP[flat_type]],
-            'geo_plz': [str(plz)],
-            'balcony': [has_balcony],
-            'lift': [has_lift],
-            'hasKitchen': [has_kitchen],
-            'garden': [has_garden],
-            'cellar': [has_cellar],
-            'yearConstructed': [float(year)],
-            'condition_was_missing': [0],
-            'interiorQual_was_missing': [0],
-            'heatingType_was_missing': [0],
-            'yearConstructed_was_missing': [0]
-        })
-
-        pred = model.predict(df_input)[0]
+        model, scorer = get_model(), get_scorer()
+
+        # Features exakt wie im Training
+        features = {
+            'date': pd.to_datetime(date_val),
+            'livingSpace': float(living_space),
+            'noRooms': float(rooms),
+            'floor': float(floor),
+            'regio1': state,
+            'regio2': city,
+            'heatingType': HEATING_MAP[heating],
+            'condition': CONDITION_MAP[condition],
+            'interiorQual': QUAL_MAP[quality],
+            'typeOfFlat': TYPE_MAP[flat_type],
+            'geo_plz': str(plz),
+            'balcony': has_balcony,
+            'lift': has_lift,
+            'hasKitchen': has_kitchen,
+            'garden': has_garden,
+            'cellar': has_cellar,
+            'yearConstructed': float(year),
+            'condition_was_missing': 0,
+            'interiorQual_was_missing': 0,
+            'heatingType_was_missing': 0,
+            'yearConstructed_was_missing': 0
+        }
+
+        if scorer is not None:
+            pred = scorer.score(features)
+        else:
+            pred = model.predict(build_input_frame(features))[0]
 
         # Ergebnis
         st.markdown(f"""
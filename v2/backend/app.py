@@ -1,15 +1,19 @@
 from __future__ import annotations
 
 from datetime import datetime
+from functools import lru_cache
+import gzip
 from pathlib import Path
-import json
-import sys
+import threading
 
 import joblib
+from joblib import Parallel, delayed, effective_n_jobs, numpy_pickle
+import numpy as np
+import orjson
 import pandas as pd
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, ORJSONResponse, Response
 from pydantic import BaseModel
 import logging
 
@@ -18,7 +22,10 @@ MODEL_PATH = BASE_DIR / "mzyana_lightgbm_model.pkl"
 GEO_PATH = BASE_DIR / "geo_data.json"
 TEMPLATE_DIR = BASE_DIR / "template"
 
-app = FastAPI(title="House Price API", version="1.0.0")
+app = FastAPI(title="House Price API", version="1.0.0", default_response_class=ORJSONResponse)
+# Set here too so predict can lazy-load when the startup hook never ran
+# (lifespan off, mounted sub-app, TestClient outside a with block).
+app.state.model = None
 
 logger = logging.getLogger("uvicorn.error")
 
@@ -68,8 +75,68 @@ QUAL_MAP = {
     "Einfach": "simple",
 }
 
+# Column layout and dtypes of the training frame, in training order so that the
+# preprocessor sees its fitted column order (checked by check_input_order). The
+# template is built once; each request only copies it and writes its values in place.
+INPUT_SCHEMA = {
+    "livingSpace": "float64",
+    "noRooms": "float64",
+    "floor": "float64",
+    "regio1": "object",
+    "regio2": "object",
+    "heatingType": "object",
+    "condition": "object",
+    "interiorQual": "object",
+    "typeOfFlat": "object",
+    "balcony": "bool",
+    "lift": "bool",
+    "hasKitchen": "bool",
+    "garden": "bool",
+    "cellar": "bool",
+    "condition_was_missing": "int64",
+    "interiorQual_was_missing": "int64",
+    "heatingType_was_missing": "int64",
+    "yearConstructed_was_missing": "int64",
+    "yearConstructed": "float64",
+    "geo_plz": "object",
+    "date": "datetime64[ns]",
+}
+INPUT_COLUMNS = list(INPUT_SCHEMA)
+DATETIME_COLUMNS = {col for col, dtype in INPUT_SCHEMA.items() if dtype.startswith("datetime64")}
+TEMPLATE_DF = pd.DataFrame({col: np.zeros(1, dtype=dtype) for col, dtype in INPUT_SCHEMA.items()})
+
+
 # Custom transformers used in the trained pipeline.
-class DateFeatureTransformer:
+def split_year_month(dates: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # Year/month straight from the datetime64[M] offset since 1970-01; NaT stays NaN.
+    months = dates.astype("datetime64[M]")
+    offset = months.astype(np.int64)
+    years, month_of_year = 1970 + offset // 12, 1 + offset % 12
+    missing = np.isnat(months)
+    if missing.any():
+        years = np.where(missing, np.nan, years)
+        month_of_year = np.where(missing, np.nan, month_of_year)
+    return years, month_of_year
+
+
+class ParallelTransformerMixin:
+    # Batch helper: row chunks are transformed on threads, since the numpy/pandas
+    # kernels underneath release the GIL. Below parallel_min_rows the split/concat
+    # overhead outweighs the gain, so small frames go straight to transform().
+    parallel_min_rows = 10_000
+
+    def transform_parallel(self, X, n_jobs=-1):
+        n_chunks = effective_n_jobs(n_jobs)
+        if len(X) < self.parallel_min_rows or n_chunks < 2:
+            return self.transform(X)
+        bounds = np.linspace(0, len(X), n_chunks + 1, dtype=int)
+        parts = Parallel(n_jobs=n_chunks, backend="threading")(
+            delayed(self.transform)(X.iloc[start:stop]) for start, stop in zip(bounds[:-1], bounds[1:])
+        )
+        return pd.concat(parts)
+
+
+class DateFeatureTransformer(ParallelTransformerMixin):
     def __init__(self, date_col):
         self.date_col = date_col
 
@@ -77,14 +144,22 @@ class DateFeatureTransformer:
         return self
 
     def transform(self, X):
-        X = X.copy()
-        X[self.date_col] = pd.to_datetime(X[self.date_col])
-        X["post_year"] = X[self.date_col].dt.year
-        X["post_month"] = X[self.date_col].dt.month
-        return X.drop(columns=[self.date_col])
+        # drop() already returns a new frame, so no up-front copy is needed.
+        dates = pd.to_datetime(X[self.date_col])
+        if dates.dt.tz is not None:
+            dates = dates.dt.tz_localize(None)
+        X = X.drop(columns=[self.date_col])
+        X["post_year"], X["post_month"] = split_year_month(dates.to_numpy())
+        return X
+
+    def transform_row(self, row):
+        date_val = pd.Timestamp(row.pop(self.date_col))
+        row["post_year"] = date_val.year
+        row["post_month"] = date_val.month
+        return row
 
 
-class GroupMedianImputer:
+class GroupMedianImputer(ParallelTransformerMixin):
     def __init__(self, group_col, target_col):
         self.group_col = group_col
         self.target_col = target_col
@@ -94,20 +169,39 @@ class GroupMedianImputer:
     def fit(self, X, y=None):
         self.global_median = X[self.target_col].median()
         self.group_medians = X.groupby(self.group_col)[self.target_col].median().to_dict()
+        self._median_lookup = None
         return self
 
+    def _lookup(self):
+        # Pickled instances predate this cache, so it is built lazily. The global
+        # median sits in the last slot, which is where category code -1 lands.
+        if getattr(self, "_median_lookup", None) is None:
+            categories = pd.Index(list(self.group_medians))
+            medians = np.fromiter(
+                (self.group_medians[c] for c in categories), dtype=np.float64, count=len(categories)
+            )
+            medians[np.isnan(medians)] = self.global_median
+            self._median_lookup = (categories, np.append(medians, self.global_median))
+        return self._median_lookup
+
     def transform(self, X):
-        X = X.copy()
-        X[self.target_col] = X.apply(
-            lambda r: self.group_medians.get(r[self.group_col], self.global_median)
-            if pd.isna(r[self.target_col])
-            else r[self.target_col],
-            axis=1,
-        )
+        X = X.copy(deep=False)
+        categories, medians = self._lookup()
+        values = X[self.target_col].to_numpy(dtype=np.float64, copy=True)
+        codes = categories.get_indexer(X[self.group_col])
+        np.putmask(values, np.isnan(values), medians[codes])
+        X[self.target_col] = values
         return X
 
+    def transform_row(self, row):
+        if pd.isna(row[self.target_col]):
+            # Same fill rule as _lookup: NaN group medians fall back to the global median.
+            fill = self.group_medians.get(row[self.group_col], self.global_median)
+            row[self.target_col] = self.global_median if pd.isna(fill) else fill
+        return row
+
 
-class CustomTargetEncoder:
+class CustomTargetEncoder(ParallelTransformerMixin):
     def __init__(self, group_col, target_col):
         self.group_col = group_col
         self.target_col = target_col
@@ -117,30 +211,258 @@ class CustomTargetEncoder:
     def fit(self, X, y=None):
         self.global_mean = X[self.target_col].mean()
         self.mappings = X.groupby(self.group_col)[self.target_col].mean().to_dict()
+        self._encoding_lookup = None
         return self
 
+    def _lookup(self):
+        # Same layout as GroupMedianImputer._lookup: unseen categories (code -1)
+        # hit the global mean stored in the last slot.
+        if getattr(self, "_encoding_lookup", None) is None:
+            categories = pd.Index(list(self.mappings))
+            encodings = np.fromiter(
+                (self.mappings[c] for c in categories), dtype=np.float64, count=len(categories)
+            )
+            encodings[np.isnan(encodings)] = self.global_mean
+            self._encoding_lookup = (categories, np.append(encodings, self.global_mean))
+        return self._encoding_lookup
+
     def transform(self, X):
-        X = X.copy()
-        X[self.group_col + "_encoded"] = X[self.group_col].map(self.mappings).fillna(self.global_mean)
+        X = X.copy(deep=False)
+        categories, encodings = self._lookup()
+        codes = categories.get_indexer(X[self.group_col])
+        X[self.group_col + "_encoded"] = encodings[codes]
         return X
 
+    def transform_row(self, row):
+        # Same fill rule as _lookup: NaN encodings fall back to the global mean.
+        encoded = self.mappings.get(row[self.group_col], self.global_mean)
+        row[self.group_col + "_encoded"] = self.global_mean if pd.isna(encoded) else encoded
+        return row
+
+
+PIPELINE_CLASSES = {
+    cls.__name__: cls for cls in (DateFeatureTransformer, GroupMedianImputer, CustomTargetEncoder)
+}
+
+
+class PipelineUnpickler(numpy_pickle.NumpyUnpickler):
+    # The pipeline was pickled from a notebook, so its custom classes are recorded
+    # as __main__.<name>; resolve those to the definitions in this module.
+    def find_class(self, module, name):
+        if module == "__main__" and name in PIPELINE_CLASSES:
+            return PIPELINE_CLASSES[name]
+        return super().find_class(module, name)
 
-# Make sure pickled pipelines referencing __main__ can resolve classes.
-sys.modules["__main__"].DateFeatureTransformer = DateFeatureTransformer
-sys.modules["__main__"].GroupMedianImputer = GroupMedianImputer
-sys.modules["__main__"].CustomTargetEncoder = CustomTargetEncoder
 
+# Guards the process-wide swap of joblib's unpickler class in load_model; predict
+# can trigger a lazy load from several threadpool workers at once.
+UNPICKLER_LOCK = threading.Lock()
 
+
+@lru_cache(maxsize=1)
 def load_geo_data() -> dict:
     if not GEO_PATH.exists():
         raise FileNotFoundError("geo_data.json not found")
-    return json.loads(GEO_PATH.read_text(encoding="utf-8"))
+    return orjson.loads(GEO_PATH.read_bytes())
+
+
+@lru_cache(maxsize=1)
+def load_geo_bytes() -> bytes:
+    # The geo data never changes at runtime, so /geo serves pre-serialized bytes.
+    return orjson.dumps(load_geo_data())
+
+
+@lru_cache(maxsize=1)
+def load_geo_gzip() -> bytes:
+    return gzip.compress(load_geo_bytes(), compresslevel=6)
 
 
+def accepts_gzip(accept_encoding: str) -> bool:
+    # An explicit gzip entry wins over "*"; q=0 means the coding is refused.
+    qualities = {}
+    for part in accept_encoding.split(","):
+        coding, *params = [item.strip() for item in part.split(";")]
+        coding = coding.lower()
+        if coding not in ("gzip", "*"):
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+    return qualities.get("gzip", qualities.get("*", 0.0)) > 0
+
+
+def geo_response(request: Request) -> Response:
+    headers = {"Cache-Control": "public, max-age=86400", "Vary": "Accept-Encoding"}
+    if accepts_gzip(request.headers.get("accept-encoding", "")):
+        headers["Content-Encoding"] = "gzip"
+        return Response(load_geo_gzip(), media_type="application/json", headers=headers)
+    return Response(load_geo_bytes(), media_type="application/json", headers=headers)
+
+
+@lru_cache(maxsize=1)
 def load_model():
     if not MODEL_PATH.exists():
         raise FileNotFoundError("Model file not found")
-    return joblib.load(MODEL_PATH)
+    # The pickle is kept uncompressed: most of the ~30 ms load is rebuilding the
+    # LightGBM booster from its model string, and decompression only adds to it.
+    # joblib.load has no unpickler hook, so swap in ours for the duration of the load.
+    with UNPICKLER_LOCK:
+        default_unpickler = numpy_pickle.NumpyUnpickler
+        numpy_pickle.NumpyUnpickler = PipelineUnpickler
+        try:
+            return joblib.load(MODEL_PATH)
+        finally:
+            numpy_pickle.NumpyUnpickler = default_unpickler
+
+
+# Scores one request directly on the LightGBM booster. The fitted pipeline state
+# is unpacked once into arrays/dicts; pipeline layouts it cannot mirror raise ValueError.
+class DirectScorer:
+
+    def __init__(self, model):
+        self.inverse_func = getattr(model, "inverse_func", None)
+        pipeline = getattr(model, "regressor_", model)
+        if not hasattr(pipeline, "named_steps"):
+            raise ValueError("model is not a Pipeline")
+
+        steps = list(pipeline.named_steps.items())
+        names = [name for name, _ in steps]
+        if "prep" not in names or names[-1] == "prep":
+            raise ValueError("pipeline has no 'prep' step followed by an estimator")
+        prep_pos = names.index("prep")
+
+        self.row_steps = [step for _, step in steps[:prep_pos]]
+        for step in self.row_steps:
+            if not hasattr(step, "transform_row"):
+                raise ValueError(f"no row fast path for {type(step).__name__}")
+
+        estimator = steps[-1][1]
+        if not hasattr(estimator, "booster_"):
+            raise ValueError("final estimator is not a fitted LightGBM model")
+        self.booster = estimator.booster_
+        self.n_features = self.booster.num_feature()
+
+        prep = pipeline.named_steps["prep"]
+        self.numeric = []
+        self.categorical = []
+        for name, transformer, columns in prep.transformers_:
+            if transformer == "drop" or name not in prep.output_indices_:
+                continue
+            out = prep.output_indices_[name]
+            if out.stop - out.start == 0:
+                continue
+            sub_steps = transformer.steps if hasattr(transformer, "steps") else [(name, transformer)]
+            encoder = sub_steps[-1][1]
+            if type(encoder).__name__ == "OneHotEncoder":
+                self.categorical.append(self._unpack_categorical(sub_steps, list(columns), out))
+            else:
+                self.numeric.append(self._unpack_numeric(sub_steps, list(columns), out))
+
+        covered = sum(out.stop - out.start for *_, out in self.numeric + self.categorical)
+        if covered != self.n_features:
+            raise ValueError(f"preprocessor yields {covered} features, booster expects {self.n_features}")
+
+    @staticmethod
+    def _unpack_numeric(sub_steps, columns, out):
+        fill = np.full(len(columns), np.nan)
+        center = np.zeros(len(columns))
+        scale = np.ones(len(columns))
+        # score() always fills first and scales second, so only that order can be mirrored.
+        seen_imputer = seen_scaler = False
+        for _, step in sub_steps:
+            kind = type(step).__name__
+            if step == "passthrough" or (kind == "FunctionTransformer" and step.func is None):
+                continue
+            if kind == "SimpleImputer" and not step.add_indicator and len(step.statistics_) == len(columns):
+                if seen_imputer or seen_scaler:
+                    raise ValueError("numeric block must have at most one imputer, before the scaler")
+                seen_imputer = True
+                fill = np.asarray(step.statistics_, dtype=np.float64)
+            elif kind == "RobustScaler":
+                if seen_scaler:
+                    raise ValueError("numeric block has more than one scaler")
+                seen_scaler = True
+                if step.center_ is not None:
+                    center = np.asarray(step.center_, dtype=np.float64)
+                if step.scale_ is not None:
+                    scale = np.asarray(step.scale_, dtype=np.float64)
+            else:
+                raise ValueError(f"unsupported numeric step {kind}")
+        if out.stop - out.start != len(columns):
+            raise ValueError("numeric block changes the number of columns")
+        return columns, fill, center, scale, out
+
+    @staticmethod
+    def _unpack_categorical(sub_steps, columns, out):
+        fill_value = None
+        for _, step in sub_steps[:-1]:
+            if type(step).__name__ != "SimpleImputer" or step.strategy != "constant" or step.add_indicator:
+                raise ValueError(f"unsupported categorical step {type(step).__name__}")
+            fill_value = step.fill_value
+        encoder = sub_steps[-1][1]
+        if encoder.drop_idx_ is not None or getattr(encoder, "_infrequent_enabled", False):
+            raise ValueError("OneHotEncoder with drop/infrequent categories is not supported")
+        if encoder.handle_unknown != "ignore":
+            # model.predict raises on unseen categories; an all-zero block would hide that.
+            raise ValueError(f"OneHotEncoder with handle_unknown={encoder.handle_unknown!r} is not supported")
+        lookups = []
+        offset = out.start
+        for categories in encoder.categories_:
+            lookups.append({cat: offset + idx for idx, cat in enumerate(categories)})
+            offset += len(categories)
+        if offset != out.stop:
+            raise ValueError("one-hot block size mismatch")
+        return columns, fill_value, lookups, out
+
+    def score(self, values: dict) -> float:
+        row = dict(values)
+        for step in self.row_steps:
+            row = step.transform_row(row)
+
+        features = np.zeros((1, self.n_features), dtype=np.float64)
+        vector = features[0]
+        for columns, fill, center, scale, out in self.numeric:
+            raw = np.array([float(row[col]) for col in columns])
+            raw = np.where(np.isnan(raw), fill, raw)
+            vector[out] = (raw - center) / scale
+        for columns, fill_value, lookups, _ in self.categorical:
+            for col, lookup in zip(columns, lookups):
+                value = row[col]
+                if value is None and fill_value is not None:
+                    value = fill_value
+                idx = lookup.get(value)
+                if idx is not None:
+                    vector[idx] = 1.0
+
+        pred = self.booster.predict(features)
+        if self.inverse_func is not None:
+            pred = self.inverse_func(pred)
+        return float(pred[0])
+
+
+def build_scorer(model) -> DirectScorer | None:
+    try:
+        return DirectScorer(model)
+    except (AttributeError, ValueError) as exc:
+        logger.warning("Direct booster scoring disabled, falling back to model.predict: %s", exc)
+        return None
+
+
+def build_input_frame(values: dict) -> pd.DataFrame:
+    df = TEMPLATE_DF.copy()
+    for idx, col in enumerate(INPUT_COLUMNS):
+        value = values[col]
+        if col in DATETIME_COLUMNS and getattr(value, "tzinfo", None) is not None:
+            # Same wall-time rule as DateFeatureTransformer; keeps the column datetime64[ns].
+            value = value.tz_localize(None)
+        df.iat[0, idx] = value
+    return df
 
 
 class PredictRequest(BaseModel):
@@ -233,12 +555,60 @@ def extract_feature_importance(model, df_input: pd.DataFrame) -> list[dict]:
     return [{"name": name, "weight": round((weight / total) * 100, 1)} for name, weight in top]
 
 
-@app.get("/health")
+@lru_cache(maxsize=4096)
+def score_cached(key: tuple) -> float:
+    # key holds the feature values in INPUT_COLUMNS order; repeated UI requests hit the cache.
+    features = dict(zip(INPUT_COLUMNS, key))
+    if app.state.scorer is not None:
+        return app.state.scorer.score(features)
+    return float(app.state.model.predict(build_input_frame(features))[0])
+
+
+def check_input_order(model) -> None:
+    pipeline = getattr(model, "regressor_", model)
+    if not hasattr(pipeline, "named_steps") or "prep" not in pipeline.named_steps:
+        return
+    expected = list(getattr(pipeline.named_steps["prep"], "feature_names_in_", []))
+    frame = TEMPLATE_DF
+    for name, step in pipeline.steps:
+        if name == "prep":
+            break
+        frame = step.transform(frame)
+    produced = [col for col in frame.columns if col in expected]
+    if expected and produced != expected:
+        raise ValueError(f"INPUT_SCHEMA order {produced} does not match the preprocessor's {expected}")
+
+
+def bind_model(state, model) -> None:
+    # Everything derived from the model alone is computed here, once per load.
+    check_input_order(model)
+    score_cached.cache_clear()
+    state.model = model
+    state.scorer = build_scorer(model)
+    state.feature_importance = extract_feature_importance(model, TEMPLATE_DF)
+
+
+@app.on_event("startup")
+def load_resources():
+    try:
+        load_geo_gzip()
+    except FileNotFoundError:
+        logger.warning("geo_data.json not found, /geo will fail until it exists")
+
+    # Load the pipeline once per process instead of unpickling it per request.
+    try:
+        bind_model(app.state, load_model())
+    except FileNotFoundError:
+        logger.warning("Model file not found, /predict will fail until it exists")
+        app.state.model = None
+
+
+@app.get("/health", response_model=None)
 def health():
     return {"status": "ok"}
 
 
-@app.get("/")
+@app.get("/", response_model=None)
 def root():
     index_path = TEMPLATE_DIR / "index.html"
     if not index_path.exists():
@@ -246,62 +616,66 @@ def root():
     return FileResponse(index_path)
 
 
-@app.get("/geo_data.json")
-def geo_data_file():
-    if not GEO_PATH.exists():
-        raise HTTPException(status_code=404, detail="geo_data.json not found")
-    return FileResponse(GEO_PATH)
+@app.get("/geo_data.json", response_model=None)
+def geo_data_file(request: Request):
+    try:
+        return geo_response(request)
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail="geo_data.json not found") from exc
 
 
 @app.exception_handler(Exception)
 def handle_unexpected_error(request: Request, exc: Exception):
     logger.exception("Unhandled error")
-    return JSONResponse(status_code=500, content={"detail": str(exc)})
+    return ORJSONResponse(status_code=500, content={"detail": str(exc)})
 
 
-@app.get("/geo")
-def geo():
+@app.get("/geo", response_model=None)
+def geo(request: Request):
     try:
-        return load_geo_data()
+        return geo_response(request)
     except FileNotFoundError as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
 
-@app.post("/predict")
+@app.post("/predict", response_model=None)
 def predict(payload: PredictRequest, request: Request):
-    try:
-        model = load_model()
-    except FileNotFoundError as exc:
-        raise HTTPException(status_code=500, detail=str(exc)) from exc
+    if request.app.state.model is None:
+        try:
+            bind_model(request.app.state, load_model())
+        except FileNotFoundError as exc:
+            raise HTTPException(status_code=500, detail=str(exc)) from exc
 
+    # Only year and month reach the model; truncating to the day keeps cache keys reusable.
     date_val = pd.to_datetime(payload.date) if payload.date else pd.to_datetime(datetime.now())
-
-    df_input = pd.DataFrame({
-        "date": [date_val],
-        "livingSpace": [float(payload.livingSpace)],
-        "noRooms": [float(payload.noRooms)],
-        "floor": [float(payload.floor)],
-        "regio1": [payload.regio1],
-        "regio2": [payload.regio2],
-        "heatingType": [HEATING_MAP.get(payload.heatingType, "central_heating")],
-        "condition": [CONDITION_MAP.get(payload.condition, "negotiable")],
-        "interiorQual": [QUAL_MAP.get(payload.interiorQual, "normal")],
-        "typeOfFlat": [TYPE_MAP.get(payload.typeOfFlat, "apartment")],
-        "geo_plz": [str(payload.geo_plz)],
-        "balcony": [bool(payload.balcony)],
-        "lift": [bool(payload.lift)],
-        "hasKitchen": [bool(payload.hasKitchen)],
-        "garden": [bool(payload.garden)],
-        "cellar": [bool(payload.cellar)],
-        "yearConstructed": [float(payload.yearConstructed)],
-        "condition_was_missing": [0],
-        "interiorQual_was_missing": [0],
-        "heatingType_was_missing": [0],
-        "yearConstructed_was_missing": [0],
-    })
+    date_val = date_val.normalize()
+
+    features = {
+        "date": date_val,
+        "livingSpace": float(payload.livingSpace),
+        "noRooms": float(payload.noRooms),
+        "floor": float(payload.floor),
+        "regio1": payload.regio1,
+        "regio2": payload.regio2,
+        "heatingType": HEATING_MAP.get(payload.heatingType, "central_heating"),
+        "condition": CONDITION_MAP.get(payload.condition, "negotiable"),
+        "interiorQual": QUAL_MAP.get(payload.interiorQual, "normal"),
+        "typeOfFlat": TYPE_MAP.get(payload.typeOfFlat, "apartment"),
+        "geo_plz": str(payload.geo_plz),
+        "balcony": bool(payload.balcony),
+        "lift": bool(payload.lift),
+        "hasKitchen": bool(payload.hasKitchen),
+        "garden": bool(payload.garden),
+        "cellar": bool(payload.cellar),
+        "yearConstructed": float(payload.yearConstructed),
+        "condition_was_missing": 0,
+        "interiorQual_was_missing": 0,
+        "heatingType_was_missing": 0,
+        "yearConstructed_was_missing": 0,
+    }
 
     try:
-        pred = model.predict(df_input)[0]
+        pred = score_cached(tuple(features[col] for col in INPUT_COLUMNS))
     except Exception as exc:
         logger.exception("Prediction failed")
         raise HTTPException(status_code=500, detail=f"Prediction failed: {exc}") from exc
@@ -309,7 +683,6 @@ def predict(payload: PredictRequest, request: Request):
     warnings = validate_inputs(payload)
     lower, upper = calculate_interval(float(pred))
     eur_per_sqm = calculate_price_per_sqm(float(pred), float(payload.livingSpace))
-    feature_importance = extract_feature_importance(model, df_input)
 
     return {
         "prediction": float(pred),
@@ -317,6 +690,6 @@ def predict(payload: PredictRequest, request: Request):
         "interval_upper": float(upper),
         "eur_per_sqm": float(eur_per_sqm) if eur_per_sqm is not None else None,
         "warnings": warnings,
-        "feature_importance": feature_importance,
+        "feature_importance": request.app.state.feature_importance,
         "confidence_note": "Intervall basiert auf ±10% Heuristik.",
     }